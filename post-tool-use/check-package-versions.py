@@ -6,28 +6,78 @@ Detects major version differences and auto-spawns research.
 Supports: npm, yarn, pnpm, bun, pip
 """
 
-import hashlib
+import functools
 import json
 import os
 import re
-import subprocess
 import sys
-import urllib.request
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
 
-# Cache file for research results (persists across hook invocations)
+# http.client, gzip, subprocess and concurrent.futures are imported where used:
+# most hook runs aren't install commands and exit before needing them
+
+# Cache file for research results (persists across hook invocations),
+# as {pkg:old->new: {"research": str, "ts": fetched_at}}
 CACHE_FILE = Path.home() / ".cache" / "claude-hooks" / "version-research.json"
+RESEARCH_CACHE_TTL = 30 * 24 * 60 * 60  # seconds
+
+# Cache file for registry "latest" lookups, as {registry:pkg: [version, fetched_at]}
+LATEST_CACHE_FILE = CACHE_FILE.parent / "latest-versions.json"
+LATEST_CACHE_TTL = 6 * 60 * 60  # seconds
 
 # Package manager command patterns
 PACKAGE_MANAGERS = {
-    "npm": r"\bnpm\s+(install|i|add)\b",
-    "yarn": r"\byarn\s+add\b",
-    "pnpm": r"\bpnpm\s+(add|install)\b",
-    "bun": r"\bbun\s+(add|install)\b",
-    "pip": r"\bpip\s+install\b",
+    "npm": re.compile(r"\bnpm\s+(install|i|add)\b"),
+    "yarn": re.compile(r"\byarn\s+add\b"),
+    "pnpm": re.compile(r"\bpnpm\s+(add|install)\b"),
+    "bun": re.compile(r"\bbun\s+(add|install)\b"),
+    "pip": re.compile(r"\bpip\s+install\b"),
+}
+
+# All managers in one alternation, so detection is a single scan of the command
+PACKAGE_MANAGER_RE = re.compile(
+    "|".join(f"(?P<{manager}>{pattern.pattern})" for manager, pattern in PACKAGE_MANAGERS.items())
+)
+
+# Install command prefixes (with optional trailing space), stripped before parsing packages
+INSTALL_PREFIXES = {
+    "npm": re.compile(r"^npm\s+(install|i|add)\s*"),
+    "yarn": re.compile(r"^yarn\s+add\s*"),
+    "pnpm": re.compile(r"^pnpm\s+(add|install)\s*"),
+    "bun": re.compile(r"^bun\s+(add|install)\s*"),
+    "pip": re.compile(r"^pip\s+install\s*"),
 }
 
+# Concurrent `claude` research subprocesses; each is a heavy process with its own
+# API connections, so scale down on small machines. Capped at the old 10, since
+# API rate limits don't grow with core count.
+RESEARCH_WORKERS = min(10, max(2, (os.cpu_count() or 4) // 2))
+
+# Wall-clock budget for the whole research phase, kept under the hook's 600s
+# timeout in settings.json so finished research still gets cached and reported
+RESEARCH_BUDGET = 480  # seconds
+
+# package.json version specs that don't name a registry version
+SKIPPED_VERSION_PREFIXES = (
+    "workspace:", "file:", "git:", "github:", "npm:", "link:", "portal:", "catalog:",
+)
+
+# Compiled once at import; several of these run per line or per package
+CD_PREFIX_RE = re.compile(r"^cd\s+([^\s&]+)\s*&&\s*")
+REQUIREMENTS_FLAG_RE = re.compile(r"-r\s+(\S+)")
+REQUIREMENT_LINE_RE = re.compile(r"([a-zA-Z0-9_-]+)\s*([=<>~!]+)\s*([\d.]+)")
+MAJOR_VERSION_RE = re.compile(r"[\s^~>=<!v]*(\d+)")
+FLAG_RE = re.compile(r"\s+--?\w+(\s+\S+)?")
+VERSION_SPEC_RE = re.compile(r"[@=<>~!]+.*$")
+
+# Idle keep-alive HTTPS connections per registry host, shared across threads
+_POOL: dict[str, list] = {}
+_POOL_LOCK = threading.Lock()
+MAX_REDIRECTS = 3
+
 
 def log(msg: str, icon: str = ""):
     """Print progress to stderr (visible to user, not captured as output)."""
@@ -35,25 +85,111 @@ def log(msg: str, icon: str = ""):
     print(f"{prefix}{msg}", file=sys.stderr)
 
 
-def load_cache() -> dict:
-    """Load research cache from disk."""
+def load_cache(path: Path = CACHE_FILE) -> dict:
+    """Load a cache file from disk (research cache by default)."""
     try:
-        if CACHE_FILE.exists():
-            with open(CACHE_FILE) as f:
-                return json.load(f)
+        if path.exists():
+            cache = json.loads(path.read_bytes())
+            # Valid JSON of the wrong shape is as good as no cache
+            if isinstance(cache, dict):
+                return cache
     except Exception:
         pass
     return {}
 
 
-def save_cache(cache: dict):
-    """Save research cache to disk."""
+@functools.cache
+def ensure_dir(directory: Path):
+    """Create directory (and parents) once per process."""
+    directory.mkdir(parents=True, exist_ok=True)
+
+
+def save_cache(cache: dict, path: Path = CACHE_FILE):
+    """Save a cache file to disk (research cache by default)."""
+    # Write a sibling temp file and rename over the original, so a parallel
+    # hook run never reads a half-written file
+    tmp = path.with_suffix(f".{os.getpid()}.tmp")
     try:
-        CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-        with open(CACHE_FILE, "w") as f:
-            json.dump(cache, f, indent=2)
+        ensure_dir(path.parent)
+        # Compact, encoded in one shot: json.dump issues a write() per token
+        tmp.write_bytes(json.dumps(cache, separators=(",", ":")).encode() + b"\n")
+        os.replace(tmp, path)
     except Exception:
-        pass
+        # Don't leave a stray temp file behind in the cache directory
+        try:
+            tmp.unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+@contextmanager
+def cache_lock(path: Path):
+    """Hold an exclusive lock on a cache file across a read-merge-write.
+
+    Parallel hook runs (one per Bash session) would otherwise overwrite
+    each other's new entries. Proceeds unlocked if the lock can't be taken.
+    """
+    try:
+        import fcntl  # POSIX-only
+    except ImportError:
+        yield
+        return
+    try:
+        ensure_dir(path.parent)
+        lock = open(path.with_suffix(".lock"), "w")
+    except OSError:
+        yield
+        return
+    with lock:
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        except OSError:
+            # e.g. ENOLCK on some network home directories
+            pass
+        yield
+
+
+def load_research_cache() -> dict:
+    """Load cached research, dropping entries past the TTL."""
+    now = time.time()
+    cache = {}
+    legacy_ts = None
+    for key, entry in load_cache().items():
+        # Entries written before timestamps were added are plain strings. Every
+        # save upgrades them, so the file's mtime is when they were last written.
+        if isinstance(entry, str):
+            if legacy_ts is None:
+                try:
+                    legacy_ts = CACHE_FILE.stat().st_mtime
+                except OSError:
+                    legacy_ts = 0
+            entry = {"research": entry, "ts": legacy_ts}
+        # Anything else that isn't {research, ts} is treated as a miss
+        if not (
+            isinstance(entry, dict)
+            and isinstance(entry.get("research"), str)
+            and isinstance(entry.get("ts"), (int, float))
+        ):
+            continue
+        if now - entry["ts"] < RESEARCH_CACHE_TTL:
+            cache[key] = entry
+    return cache
+
+
+def load_latest_cache() -> dict:
+    """Load cached registry "latest" lookups, dropping entries past the TTL."""
+    now = time.time()
+    cache = {}
+    for key, entry in load_cache(LATEST_CACHE_FILE).items():
+        # Anything but [version, fetched_at] is treated as a miss
+        if not (isinstance(entry, (list, tuple)) and len(entry) == 2):
+            continue
+        version, fetched_at = entry
+        if not isinstance(version, str) or not isinstance(fetched_at, (int, float)):
+            continue
+        if now - fetched_at < LATEST_CACHE_TTL:
+            cache[key] = entry
+    return cache
 
 
 def cache_key(pkg: str, old_major: int, new_major: int) -> str:
@@ -61,13 +197,113 @@ def cache_key(pkg: str, old_major: int, new_major: int) -> str:
     return f"{pkg}:{old_major}->{new_major}"
 
 
+@functools.cache
+def _https_proxy(host: str) -> tuple[str, int | None, dict[str, str]] | None:
+    """Proxy (host, port, tunnel headers) for host, as urlopen would pick it.
+
+    Honours HTTPS_PROXY/https_proxy and no_proxy via urllib's own lookup.
+    """
+    import base64
+    import urllib.parse
+    import urllib.request
+
+    proxy = urllib.request.getproxies().get("https")
+    if not proxy or urllib.request.proxy_bypass(host):
+        return None
+    if "://" not in proxy:
+        proxy = f"http://{proxy}"
+    parts = urllib.parse.urlsplit(proxy)
+    headers = {}
+    if parts.username:
+        credentials = f"{urllib.parse.unquote(parts.username)}:{urllib.parse.unquote(parts.password or '')}"
+        headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode()).decode()
+    return parts.hostname, parts.port, headers
+
+
+def _acquire_connection(host: str):
+    """Take an idle connection to host from the pool, or open a new one."""
+    import http.client
+
+    with _POOL_LOCK:
+        idle = _POOL.get(host)
+        if idle:
+            return idle.pop()
+
+    proxy = _https_proxy(host)
+    if proxy:
+        # CONNECT through the proxy, then TLS to the registry
+        proxy_host, proxy_port, tunnel_headers = proxy
+        conn = http.client.HTTPSConnection(proxy_host, proxy_port, timeout=5)
+        conn.set_tunnel(host, 443, headers=tunnel_headers)
+        return conn
+    return http.client.HTTPSConnection(host, timeout=5)
+
+
+def _release_connection(host: str, conn):
+    """Return a connection to the pool for reuse by the next lookup."""
+    with _POOL_LOCK:
+        _POOL.setdefault(host, []).append(conn)
+
+
+def fetch(host: str, path: str, headers: dict[str, str] | None = None) -> bytes | None:
+    """GET a response body over a pooled keep-alive connection."""
+    import gzip
+    import http.client
+
+    stale_retried = False
+    redirects = 0
+    while True:
+        conn = _acquire_connection(host)
+        reused = conn.sock is not None
+        try:
+            conn.request("GET", path, headers={"Accept-Encoding": "gzip", **(headers or {})})
+            response = conn.getresponse()
+            body = response.read()
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            # The server may have dropped an idle socket; retry once on a fresh one
+            if reused and not stale_retried:
+                stale_retried = True
+                continue
+            return None
+
+        if response.will_close:
+            conn.close()
+        else:
+            _release_connection(host, conn)
+
+        # Follow same-host redirects (e.g. PyPI name normalization)
+        location = response.getheader("Location")
+        if response.status in (301, 302, 307, 308) and location:
+            path = location.removeprefix(f"https://{host}")
+            if path.startswith("/") and redirects < MAX_REDIRECTS:
+                redirects += 1
+                continue
+            return None
+
+        if response.status != 200:
+            return None
+        if response.getheader("Content-Encoding") == "gzip":
+            return gzip.decompress(body)
+        return body
+
+
+def fetch_json(host: str, path: str, headers: dict[str, str] | None = None) -> dict | None:
+    """GET and decode a JSON document."""
+    body = fetch(host, path, headers)
+    return json.loads(body) if body else None
+
+
 def get_npm_latest(package_name: str) -> str | None:
     """Fetch latest version from npm registry."""
     try:
-        url = f"https://registry.npmjs.org/{package_name}"
-        with urllib.request.urlopen(url, timeout=5) as response:
-            data = json.loads(response.read().decode())
-            return data.get("dist-tags", {}).get("latest")
+        # Abbreviated packument: dist-tags plus a slim versions map, not every manifest
+        data = fetch_json(
+            "registry.npmjs.org",
+            f"/{package_name}",
+            headers={"Accept": "application/vnd.npm.install-v1+json"},
+        )
+        return (data or {}).get("dist-tags", {}).get("latest")
     except Exception:
         return None
 
@@ -75,10 +311,8 @@ def get_npm_latest(package_name: str) -> str | None:
 def get_pypi_latest(package_name: str) -> str | None:
     """Fetch latest version from PyPI."""
     try:
-        url = f"https://pypi.org/pypi/{package_name}/json"
-        with urllib.request.urlopen(url, timeout=5) as response:
-            data = json.loads(response.read().decode())
-            return data.get("info", {}).get("version")
+        data = fetch_json("pypi.org", f"/pypi/{package_name}/json")
+        return data.get("info", {}).get("version") if data else None
     except Exception:
         return None
 
@@ -88,7 +322,8 @@ def get_major_version(version_str: str) -> int | None:
     if not version_str:
         return None
     # Handle semver constraints: ^14.0.0, ~14.0.0, >=14.0.0, 14.0.0
-    match = re.search(r"(\d+)", version_str)
+    # Anchored, so tags, aliases and git refs (latest, npm:x@2, user/repo#1a2b) don't parse
+    match = MAJOR_VERSION_RE.match(version_str)
     return int(match.group(1)) if match else None
 
 
@@ -101,14 +336,13 @@ def parse_package_json(cwd: str) -> dict[str, str]:
         return packages
 
     try:
-        with open(pkg_path) as f:
-            data = json.load(f)
+        data = json.loads(pkg_path.read_bytes())
 
         for dep_type in ["dependencies", "devDependencies"]:
             deps = data.get(dep_type, {})
             for name, version in deps.items():
-                # Skip workspace/file/git references
-                if not version.startswith(("workspace:", "file:", "git:", "github:")):
+                # Skip workspace/file/git/alias references
+                if not version.startswith(SKIPPED_VERSION_PREFIXES):
                     packages[name] = version
     except Exception:
         pass
@@ -116,10 +350,10 @@ def parse_package_json(cwd: str) -> dict[str, str]:
     return packages
 
 
-def parse_requirements_txt(cwd: str) -> dict[str, str]:
-    """Parse requirements.txt for packages with versions."""
+def parse_requirements_txt(req_file: str) -> dict[str, str]:
+    """Parse a requirements file for packages with versions."""
     packages = {}
-    req_path = Path(cwd) / "requirements.txt"
+    req_path = Path(req_file)
 
     if not req_path.exists():
         return packages
@@ -136,7 +370,7 @@ def parse_requirements_txt(cwd: str) -> dict[str, str]:
                     continue
 
                 # Parse: package==1.0.0, package>=1.0.0, package~=1.0.0
-                match = re.match(r"([a-zA-Z0-9_-]+)\s*([=<>~!]+)\s*([\d.]+)", line)
+                match = REQUIREMENT_LINE_RE.match(line)
                 if match:
                     packages[match.group(1)] = match.group(3)
     except Exception:
@@ -147,42 +381,64 @@ def parse_requirements_txt(cwd: str) -> dict[str, str]:
 
 def parse_command_packages(command: str, manager: str) -> list[str]:
     """Extract package names from install command."""
-    # Remove the install command prefix (with optional trailing space)
-    patterns = {
-        "npm": r"^npm\s+(install|i|add)\s*",
-        "yarn": r"^yarn\s+add\s*",
-        "pnpm": r"^pnpm\s+(add|install)\s*",
-        "bun": r"^bun\s+(add|install)\s*",
-        "pip": r"^pip\s+install\s*",
-    }
-
-    cmd = re.sub(patterns.get(manager, ""), "", command)
+    # Remove the install command prefix
+    prefix = INSTALL_PREFIXES.get(manager)
+    cmd = prefix.sub("", command) if prefix else command
     # Remove flags
-    cmd = re.sub(r"\s+--?\w+(\s+\S+)?", " ", cmd)
+    cmd = FLAG_RE.sub(" ", cmd)
     # Split and clean
     packages = []
     for pkg in cmd.split():
         if pkg and not pkg.startswith("-"):
             # Remove version specifier for lookup
-            name = re.sub(r"[@=<>~!]+.*$", "", pkg)
+            name = VERSION_SPEC_RE.sub("", pkg)
             if name:
                 packages.append(name)
 
     return packages
 
 
-def check_version_diff(pkg: str, installed_version: str, registry: str) -> dict | None:
+def get_latest_versions(packages: list[str], registry: str, latest_cache: dict) -> dict[str, str]:
+    """Resolve latest versions for all packages in one batch.
+
+    Fresh entries in latest_cache are used as-is. The rest are fetched
+    concurrently over the pooled registry connections (max 16 in flight)
+    and added to latest_cache.
+    """
+    latest = {}
+    missing = []
+    for pkg in packages:
+        entry = latest_cache.get(f"{registry}:{pkg}")
+        if entry:
+            latest[pkg] = entry[0]
+        else:
+            missing.append(pkg)
+
+    if missing:
+        fetch_latest = get_npm_latest if registry == "npm" else get_pypi_latest
+        fetched_at = time.time()
+        # A single lookup (e.g. `npm install foo`) doesn't need worker threads
+        if len(missing) == 1:
+            versions = [fetch_latest(missing[0])]
+        else:
+            from concurrent.futures import ThreadPoolExecutor
+
+            with ThreadPoolExecutor(max_workers=min(16, len(missing))) as executor:
+                versions = list(executor.map(fetch_latest, missing))
+        for pkg, version in zip(missing, versions):
+            if version:
+                latest[pkg] = version
+                latest_cache[f"{registry}:{pkg}"] = [version, fetched_at]
+
+    return latest
+
+
+def check_version_diff(pkg: str, installed_version: str, latest: str | None) -> dict | None:
     """Check if major version differs from latest."""
     installed_major = get_major_version(installed_version)
     if installed_major is None:
         return None
 
-    # Get latest version
-    if registry == "npm":
-        latest = get_npm_latest(pkg)
-    else:
-        latest = get_pypi_latest(pkg)
-
     if not latest:
         return None
 
@@ -203,7 +459,7 @@ def check_version_diff(pkg: str, installed_version: str, registry: str) -> dict
     return None
 
 
-def spawn_research(pkg: str, old_major: int, new_major: int) -> str:
+def spawn_research(pkg: str, old_major: int, new_major: int, timeout: float = 300) -> str:
     """Spawn Claude to research breaking changes."""
     prompt = f"""Breaking changes: {pkg} v{old_major} → v{new_major}
 
@@ -216,6 +472,8 @@ Return ONLY:
 Be terse. No migration guides, no installation steps, no sources, no headers.
 This gets injected into context - every word costs attention."""
 
+    import subprocess
+
     try:
         result = subprocess.run(
             [
@@ -223,11 +481,15 @@ This gets injected into context - every word costs attention."""
                 "--output-format", "text",
                 "--dangerously-skip-permissions",
             ],
-            capture_output=True,
-            text=True,
-            timeout=300,
+            # Only stdout is used: don't buffer stderr, and don't hand claude
+            # the hook's stdin
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=timeout,
         )
-        return result.stdout.strip()
+        # Decode the raw bytes once at the end
+        return result.stdout.decode(errors="replace").strip()
     except subprocess.TimeoutExpired:
         return f"(Research timed out for {pkg})"
     except Exception as e:
@@ -241,12 +503,12 @@ def filter_redundant_types(diffs: list[dict]) -> list[dict]:
     filtered = []
     for diff in diffs:
         pkg = diff["package"]
-        # Skip @types/X if X is already in the list
-        if pkg.startswith("@types/"):
-            base_name = pkg.replace("@types/", "")
-            if base_name in base_packages:
-                log(f"Skipping {pkg} (redundant with {base_name})", "↩️")
-                continue
+        # Skip @types/X if X is already in the list (strip the prefix only, not
+        # every occurrence of "@types/")
+        base_name = pkg.removeprefix("@types/")
+        if base_name != pkg and base_name in base_packages:
+            log(f"Skipping {pkg} (redundant with {base_name})", "↩️")
+            continue
         filtered.append(diff)
 
     return filtered
@@ -255,8 +517,9 @@ def filter_redundant_types(diffs: list[dict]) -> list[dict]:
 def main():
     # Read hook input from stdin
     try:
-        hook_input = json.load(sys.stdin)
-    except json.JSONDecodeError:
+        # One read of the raw bytes; json.loads detects the encoding itself
+        hook_input = json.loads(sys.stdin.buffer.read())
+    except ValueError:
         sys.exit(0)
 
     tool_name = hook_input.get("tool_name", "")
@@ -270,7 +533,7 @@ def main():
     cwd = os.getcwd()
 
     # Extract directory from "cd X && ..." pattern
-    cd_match = re.match(r'^cd\s+([^\s&]+)\s*&&\s*', command)
+    cd_match = CD_PREFIX_RE.match(command)
     if cd_match:
         cd_path = cd_match.group(1)
         # Handle absolute and relative paths
@@ -283,11 +546,8 @@ def main():
         command = command[cd_match.end():]
 
     # Detect package manager
-    detected_manager = None
-    for manager, pattern in PACKAGE_MANAGERS.items():
-        if re.search(pattern, command):
-            detected_manager = manager
-            break
+    manager_match = PACKAGE_MANAGER_RE.search(command)
+    detected_manager = manager_match.lastgroup if manager_match else None
 
     if not detected_manager:
         sys.exit(0)
@@ -303,7 +563,7 @@ def main():
     # Check for pip -r flag (read from requirements file)
     pip_requirements_file = None
     if detected_manager == "pip":
-        req_match = re.search(r'-r\s+(\S+)', command)
+        req_match = REQUIREMENTS_FLAG_RE.search(command)
         if req_match:
             pip_requirements_file = req_match.group(1)
             # Resolve relative to cwd
@@ -319,7 +579,7 @@ def main():
         if registry == "npm":
             installed = parse_package_json(cwd)
         else:
-            installed = parse_requirements_txt(cwd)
+            installed = parse_requirements_txt(os.path.join(cwd, "requirements.txt"))
         for pkg in explicit_packages:
             if pkg in installed:
                 packages_to_check[pkg] = installed[pkg]
@@ -331,21 +591,7 @@ def main():
             # For pip, use specified requirements file or look in cwd
             req_file = pip_requirements_file or os.path.join(cwd, "requirements.txt")
             log(f"Parsing {req_file}", "📄")
-            packages_to_check = parse_requirements_txt(os.path.dirname(req_file))
-            # Override the parse function to use the specific file
-            if pip_requirements_file:
-                packages_to_check = {}
-                try:
-                    with open(pip_requirements_file) as f:
-                        for line in f:
-                            line = line.strip()
-                            if not line or line.startswith("#") or line.startswith("-"):
-                                continue
-                            match = re.match(r"([a-zA-Z0-9_-]+)\s*([=<>~!]+)\s*([\d.]+)", line)
-                            if match:
-                                packages_to_check[match.group(1)] = match.group(3)
-                except Exception:
-                    pass
+            packages_to_check = parse_requirements_txt(req_file)
 
     if not packages_to_check:
         log("No packages to check", "✓")
@@ -353,10 +599,25 @@ def main():
 
     log(f"Checking {len(packages_to_check)} packages for version diffs...", "🔍")
 
+    # Prefetch every latest version up front, then diff against the results
+    latest_cache = load_latest_cache()
+    cached_keys = set(latest_cache)
+    # Only look up packages whose installed version has a parseable major
+    latest_versions = get_latest_versions(
+        [pkg for pkg, version in packages_to_check.items() if get_major_version(version) is not None],
+        registry,
+        latest_cache,
+    )
+    fetched = {key: entry for key, entry in latest_cache.items() if key not in cached_keys}
+    if fetched:
+        # Merge with whatever other hook runs wrote since we loaded
+        with cache_lock(LATEST_CACHE_FILE):
+            save_cache({**load_latest_cache(), **fetched}, LATEST_CACHE_FILE)
+
     # Check for major version differences
     diffs = []
     for pkg, version in packages_to_check.items():
-        diff = check_version_diff(pkg, version, registry)
+        diff = check_version_diff(pkg, version, latest_versions.get(pkg))
         if diff:
             diffs.append(diff)
 
@@ -370,7 +631,7 @@ def main():
     log(f"Found {len(diffs)} packages with major version diffs", "⚠️")
 
     # Load cache
-    cache = load_cache()
+    cache = load_research_cache()
 
     # Separate cached vs uncached diffs
     cached_results = []
@@ -380,12 +641,13 @@ def main():
         key = cache_key(diff["package"], diff["installed_major"], diff["latest_major"])
         if key in cache:
             log(f"Cache hit: {diff['package']}", "⚡")
-            cached_results.append({**diff, "research": cache[key]})
+            cached_results.append({**diff, "research": cache[key]["research"]})
         else:
             uncached_diffs.append(diff)
 
     # Spawn research for uncached diffs in parallel
     research_results = list(cached_results)
+    new_research = {}
 
     if uncached_diffs:
         # Build a compact list of what we're researching
@@ -395,17 +657,26 @@ def main():
         )
         log(f"Researching: {research_list}", "⏳")
 
+        deadline = time.monotonic() + RESEARCH_BUDGET
+
         def research_worker(diff):
             """Worker function for parallel research."""
+            # Queued work shares the overall budget, so every worker is done by the deadline
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return {**diff, "research": f"(Research skipped for {diff['package']}: time budget exhausted)"}
             research = spawn_research(
                 diff["package"],
                 diff["installed_major"],
                 diff["latest_major"],
+                timeout=min(300, remaining),
             )
             return {**diff, "research": research}
 
-        # Run all research in parallel (max 10 concurrent)
-        with ThreadPoolExecutor(max_workers=10) as executor:
+        from concurrent.futures import ThreadPoolExecutor, as_completed
+
+        # Run all research in parallel (max RESEARCH_WORKERS concurrent)
+        with ThreadPoolExecutor(max_workers=RESEARCH_WORKERS) as executor:
             futures = {executor.submit(research_worker, diff): diff for diff in uncached_diffs}
             for future in as_completed(futures):
                 try:
@@ -414,7 +685,7 @@ def main():
                     # Cache the result (but not failures)
                     if not result["research"].startswith("("):
                         key = cache_key(result["package"], result["installed_major"], result["latest_major"])
-                        cache[key] = result["research"]
+                        new_research[key] = {"research": result["research"], "ts": time.time()}
                         log(f"Completed: {result['package']}", "✅")
                     else:
                         log(f"Failed: {result['package']} (not cached)", "❌")
@@ -425,8 +696,9 @@ def main():
                         "research": f"(Research failed: {e})"
                     })
 
-        # Save updated cache
-        save_cache(cache)
+        # Save updated cache, merged with whatever other hook runs wrote meanwhile
+        with cache_lock(CACHE_FILE):
+            save_cache({**load_research_cache(), **new_research})
         log("Research cached for future use", "💾")
 
     # Build output with summary table
@@ -458,7 +730,7 @@ def main():
 """
 
     # Build user-visible summary
-    cached_count = len([r for r in research_results if r in cached_results])
+    cached_count = len(cached_results)
     researched_count = len(research_results) - cached_count
 
     if researched_count > 0: